@@ -0,0 +1,19 @@
+import os
+
+# Serve the ASGI app so the async views can overlap requests while the
+# CPU-bound matching and PDF work runs in threads.
+wsgi_app = "core.asgi:application"
+worker_class = "uvicorn_worker.UvicornWorker"
+
+# Import the app once in the master process, warm the models up (see
+# when_ready) and fork workers from it, so the spaCy model is shared
+# between them.
+preload_app = True
+workers = int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
+
+
+def when_ready(server):
+    # Runs in the master after the app is preloaded and before workers fork
+    from home.views import warm_up
+
+    warm_up()
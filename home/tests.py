@@ -1,3 +1,97 @@
-from django.test import TestCase
+import json
 
-# Create your tests here.
+from django.test import RequestFactory, SimpleTestCase
+
+from home.views import JobMatcher, rank_candidates
+
+
+class SkillExtractionTests(SimpleTestCase):
+    def setUp(self):
+        self.matcher = JobMatcher()
+
+    def test_matches_whole_words_only(self):
+        self.assertNotIn('ai', self.matcher.extract_skills_from_text("Send your CV by email"))
+        self.assertIn('ai', self.matcher.extract_skills_from_text("Experience with AI products"))
+
+    def test_prefers_longest_keyword(self):
+        skills = self.matcher.extract_skills_from_text("Senior JavaScript developer")
+        self.assertIn('javascript', skills)
+        self.assertNotIn('java', skills)
+
+    def test_plural_and_js_suffixes(self):
+        skills = self.matcher.extract_skills_from_text("Build REST APIs in ReactJS and Vue.js")
+        self.assertEqual(sorted(skills), ['api', 'react', 'rest', 'vue'])
+
+
+class ExperienceYearsTests(SimpleTestCase):
+    def setUp(self):
+        self.matcher = JobMatcher()
+
+    def test_year_forms(self):
+        self.assertEqual(self.matcher.extract_experience_years("5 years of experience"), 5)
+        self.assertEqual(self.matcher.extract_experience_years("3+ yrs of experience"), 3)
+        self.assertEqual(self.matcher.extract_experience_years("2 Years in Python, 4 yrs exp"), 4)
+        self.assertEqual(self.matcher.extract_experience_years("No experience needed"), 0)
+        self.assertEqual(
+            self.matcher.extract_experience_years("Founded 25 years of innovation; 3 years of experience required"), 3
+        )
+        self.assertEqual(
+            self.matcher.extract_experience_years("Backed by 40 years of industry leadership, 2 years experience"), 2
+        )
+
+
+class RankCandidatesTests(SimpleTestCase):
+    job_description = "Python developer with Django and AWS, 3 years of experience"
+
+    def setUp(self):
+        self.matcher = JobMatcher()
+
+    def test_batch_similarity_matches_pairwise(self):
+        candidate = {
+            'about': "Backend developer",
+            'skills': ['Python', 'Django'],
+            'experience': [{'company': 'Acme', 'description': "Built Django services on AWS"}],
+        }
+        pairwise = self.matcher.compute_similarity_score(self.job_description, candidate)
+        batch = self.matcher.compute_similarity_scores(self.job_description, [candidate])
+        self.assertGreater(pairwise, 0)
+        self.assertAlmostEqual(batch[0], pairwise)
+
+    def test_null_text_fields(self):
+        candidates = [{
+            'about': None,
+            'skills': ['Python'],
+            'experience': [{'company': 'Acme', 'description': None}],
+            'projects': [{'title': 'Site', 'description': None}],
+        }]
+        ranked = self.matcher.rank_candidates_batch(self.job_description, candidates)
+        self.assertEqual(ranked[0]['matched_skills'], ['python'])
+
+    async def test_view_keeps_client_keys_and_ignores_cache_keys(self):
+        body = {
+            'job_description': self.job_description,
+            'candidates': [{'_id': 'abc', 'skills': ['Python'], '_skills_lower': 'python', '_text': 1}],
+        }
+        request = RequestFactory().post('/', json.dumps(body), content_type='application/json')
+        data = json.loads((await rank_candidates(request)).content)
+        self.assertTrue(data['success'])
+        self.assertEqual(data['ranked_candidates'][0]['candidate'], {'_id': 'abc', 'skills': ['Python']})
+
+
+class GenerateResumeTests(SimpleTestCase):
+    async def test_returns_pdf(self):
+        response = await self.async_client.post('/generate-resume/', {
+            'name': 'Jane Doe',
+            'about': 'Backend developer',
+            'skill1': 'Python',
+            'company1': 'Acme',
+            'post1': 'Engineer',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="Jane_Doe.pdf"')
+        self.assertTrue(response.content.startswith(b'%PDF'))
+
+    async def test_rejects_get(self):
+        response = await self.async_client.get('/generate-resume/')
+        self.assertEqual(response.status_code, 405)
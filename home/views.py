@@ -2,42 +2,60 @@ from django.shortcuts import render
 from django.http import HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
+import asyncio
 import json
 import re
 import logging
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import threading
+from functools import lru_cache
 from collections import Counter
-import spacy
 from datetime import datetime
 
-# PDF Generation imports
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.colors import HexColor
-from io import BytesIO
+# numpy, scikit-learn, spaCy and ReportLab are imported where they are used,
+# so requests that need none of them (and manage.py) start quickly
 
 logger = logging.getLogger(__name__)
 
-# Initialize spaCy model (install with: python -m spacy download en_core_web_sm)
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    nlp = None
-    logger.warning("spaCy model not found. Install with: python -m spacy download en_core_web_sm")
+_spacy_nlp = None
+_spacy_loaded = False
+_spacy_lock = threading.Lock()
+
+def _get_nlp():
+    """Load the spaCy model on first use; None if it is not installed"""
+    global _spacy_nlp, _spacy_loaded
+    if not _spacy_loaded:
+        with _spacy_lock:
+            if not _spacy_loaded:
+                import spacy
+                # Install with: python -m spacy download en_core_web_sm
+                try:
+                    _spacy_nlp = spacy.load("en_core_web_sm")
+                except OSError:
+                    logger.warning("spaCy model not found. Install with: python -m spacy download en_core_web_sm")
+                _spacy_loaded = True
+    return _spacy_nlp
+
+# "5 years of experience", "3+ yrs exp", "2 years in ..."
+_EXPERIENCE_RE = re.compile(
+    r'(\d+)\s*\+?\s*(?:(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)|years?\s*in\b)',
+    re.IGNORECASE
+)
+
+# Keys JobMatcher caches on candidate dicts; never trusted from or returned to clients
+_CANDIDATE_CACHE_KEYS = ('_skills_lower', '_text')
+
+def _without_cache_keys(candidate):
+    """Shallow copy of a candidate dict without the matcher's cache entries"""
+    return {k: v for k, v in candidate.items() if k not in _CANDIDATE_CACHE_KEYS}
 
 class JobMatcher:
     """Handles job description parsing and candidate matching"""
     
     def __init__(self):
-        self.vectorizer = TfidfVectorizer(
-            max_features=1000,
-            stop_words='english',
-            ngram_range=(1, 2),
-            min_df=1
-        )
+        self._vectorizer = None
+        # Hashed term counts depend only on the text, so they can be reused
+        # whenever the same candidate pool is ranked against another job
+        self._hashed_counts = lru_cache(maxsize=4096)(self._hash_text)
         self.skill_keywords = [
             'python', 'java', 'javascript', 'react', 'nodejs', 'django', 'flask',
             'sql', 'mongodb', 'postgresql', 'mysql', 'aws', 'azure', 'docker',
@@ -46,20 +64,48 @@ class JobMatcher:
             'vue', 'tensorflow', 'pytorch', 'pandas', 'numpy', 'api', 'rest',
             'microservices', 'cloud computing', 'blockchain', 'cybersecurity'
         ]
+        # Lowercased and deduplicated once; matches are reported in this form
+        self._skill_set = frozenset(s.lower() for s in self.skill_keywords)
+        # Single alternation matched on word boundaries, so "ai" no longer hits "email".
+        # Longest keywords first so e.g. "javascript" wins over "java".
+        # A plural or JS suffix is allowed, so "APIs" and "ReactJS" / "Vue.js" still match.
+        self._skill_re = re.compile(
+            r'\b(' + '|'.join(re.escape(s) for s in sorted(self._skill_set, key=len, reverse=True)) + r')(?:s|\.?js)?\b',
+            re.IGNORECASE
+        )
+    
+    @property
+    def vectorizer(self):
+        """Hashed TF-IDF pipeline, built on first use"""
+        if self._vectorizer is None:
+            from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+            from sklearn.pipeline import make_pipeline
+            
+            # Hashed TF-IDF: no vocabulary to build, same fit_transform API.
+            # Acts as a template: each fit runs on a clone so views running in
+            # worker threads never share fitted IDF state.
+            self._vectorizer = make_pipeline(
+                HashingVectorizer(
+                    n_features=2**14,
+                    stop_words='english',
+                    ngram_range=(1, 2),
+                    alternate_sign=False
+                ),
+                TfidfTransformer()
+            )
+        return self._vectorizer
     
-    def extract_skills_from_text(self, text):
+    def extract_skills_from_text(self, text, use_spacy=False):
         """Extract skills from job description or resume text"""
-        text_lower = text.lower()
-        found_skills = []
-        
         # Basic keyword matching
-        for skill in self.skill_keywords:
-            if skill.lower() in text_lower:
-                found_skills.append(skill)
+        found_skills = [m.group(1).lower() for m in self._skill_re.finditer(text)]
         
-        # Use spaCy for entity extraction if available
-        if nlp:
-            doc = nlp(text)
+        # spaCy entity extraction is opt-in: it is slow and mostly adds noisy
+        # ORG/PRODUCT tokens, so only the interactive endpoints ask for it
+        nlp = _get_nlp() if use_spacy else None
+        if nlp is not None:
+            # Only NER is needed
+            doc = nlp(text, disable=['tagger', 'parser', 'attribute_ruler', 'lemmatizer'])
             for ent in doc.ents:
                 if ent.label_ in ['ORG', 'PRODUCT', 'SKILL']:  # Custom skill entities
                     found_skills.append(ent.text.lower())
@@ -68,92 +114,152 @@ class JobMatcher:
     
     def extract_experience_years(self, text):
         """Extract years of experience from text"""
-        patterns = [
-            r'(\d+)\s*(?:\+)?\s*years?\s*(?:of\s*)?(?:experience|exp)',
-            r'(\d+)\s*(?:\+)?\s*yrs?\s*(?:experience|exp)',
-            r'(\d+)\s*(?:\+)?\s*years?\s*in',
-        ]
-        
-        years = []
-        for pattern in patterns:
-            matches = re.findall(pattern, text.lower())
-            years.extend([int(match) for match in matches])
-        
-        return max(years) if years else 0
+        years = _EXPERIENCE_RE.findall(text)
+        return max(map(int, years)) if years else 0
+    
+    def _build_candidate_text(self, candidate_data):
+        """Combine the free-text fields of a candidate into one document"""
+        # `or ''` also covers fields sent as null
+        return ' '.join([
+            candidate_data.get('about') or '',
+            *candidate_data.get('skills', []),
+            *(exp.get('description') or '' for exp in candidate_data.get('experience', [])),
+            *(proj.get('description') or '' for proj in candidate_data.get('projects', [])),
+        ])
+    
+    def _candidate_text(self, candidate):
+        """Candidate document, cached on the candidate dict for re-rankings"""
+        if '_text' not in candidate:
+            candidate['_text'] = self._build_candidate_text(candidate)
+        return candidate['_text']
+    
+    def _hash_text(self, text):
+        """Hashed term counts for a single text (stateless, thread-safe)"""
+        return self.vectorizer[0].transform([text])
     
     def compute_similarity_score(self, job_description, candidate_data):
         """Compute similarity score between job and candidate"""
+        from sklearn.base import clone
+        
         # Combine candidate text
-        candidate_text = f"""
-        {candidate_data.get('about', '')} 
-        {' '.join(candidate_data.get('skills', []))}
-        {' '.join([exp.get('description', '') for exp in candidate_data.get('experience', [])])}
-        {' '.join([proj.get('description', '') for proj in candidate_data.get('projects', [])])}
-        """
+        candidate_text = self._build_candidate_text(candidate_data)
         
-        # Vectorize texts
-        try:
-            texts = [job_description, candidate_text]
-            tfidf_matrix = self.vectorizer.fit_transform(texts)
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-            return float(similarity)
-        except:
+        if not job_description.strip() or not candidate_text.strip():
             return 0.0
+        
+        # Vectorize texts
+        texts = [job_description, candidate_text]
+        tfidf_matrix = clone(self.vectorizer).fit_transform(texts)
+        # Rows are already L2-normalized by TfidfTransformer
+        similarity = tfidf_matrix[0].multiply(tfidf_matrix[1]).sum()
+        return float(similarity)
     
-    def rank_candidates(self, job_description, candidates_list):
-        """Rank candidates based on job requirements"""
-        job_skills = self.extract_skills_from_text(job_description)
+    def compute_similarity_scores(self, job_description, candidates_list):
+        """Compute similarity scores between a job and many candidates with a single fit"""
+        from scipy.sparse import vstack
+        from sklearn.base import clone
+        
+        texts = [job_description] + [self._candidate_text(c) for c in candidates_list]
+        counts = vstack([self._hashed_counts(text) for text in texts])
+        # Only the IDF weighting depends on the pool, so refit just that step
+        tfidf_matrix = clone(self.vectorizer[-1]).fit_transform(counts)
+        # Rows are already L2-normalized by TfidfTransformer, so cosine
+        # similarity is a single sparse dot product against the job row
+        return (tfidf_matrix[1:] @ tfidf_matrix[0].T).toarray().ravel()
+    
+    def rank_candidates_batch(self, job_description, candidates_list):
+        """Rank candidates based on job requirements, vectorizing the whole pool at once"""
+        import numpy as np
+        
+        if not candidates_list:
+            return []
+        
+        job_skills = self.extract_skills_from_text(job_description, use_spacy=False)
         job_experience_req = self.extract_experience_years(job_description)
         
-        scored_candidates = []
+        # Similarity scores (40% weight)
+        similarity_scores = self.compute_similarity_scores(job_description, candidates_list)
         
+        # Loop invariants
+        job_skills_lower = {s.lower() for s in job_skills}
+        
+        # Cache lowercase skills on each candidate so re-ranking the same
+        # pool against another job skips the lowercasing
         for candidate in candidates_list:
-            # Similarity score (40% weight)
-            similarity_score = self.compute_similarity_score(job_description, candidate)
-            
-            # Skill match score (30% weight)
-            candidate_skills = candidate.get('skills', [])
-            skill_matches = len(set(job_skills) & set([s.lower() for s in candidate_skills]))
-            skill_score = skill_matches / max(len(job_skills), 1)
-            
-            # Experience score (20% weight)
-            candidate_exp = len([exp for exp in candidate.get('experience', []) if exp.get('company')])
-            experience_score = min(candidate_exp / max(job_experience_req, 1), 1.0)
-            
-            # Education score (10% weight)
-            education_score = len([edu for edu in candidate.get('education', []) if edu.get('degree')]) * 0.2
-            education_score = min(education_score, 1.0)
-            
-            # Composite score
-            final_score = (
-                similarity_score * 0.4 +
-                skill_score * 0.3 +
-                experience_score * 0.2 +
-                education_score * 0.1
-            )
-            
-            scored_candidates.append({
-                'candidate': candidate,
-                'score': final_score,
-                'similarity_score': similarity_score,
-                'skill_score': skill_score,
-                'experience_score': experience_score,
-                'education_score': education_score,
-                'matched_skills': [s for s in job_skills if s.lower() in [cs.lower() for cs in candidate_skills]]
-            })
-        
-        return sorted(scored_candidates, key=lambda x: x['score'], reverse=True)
+            if '_skills_lower' not in candidate:
+                candidate['_skills_lower'] = frozenset(s.lower() for s in candidate.get('skills', []))
+        
+        n = len(candidates_list)
+        
+        # Skill match score (30% weight)
+        skill_counts = np.fromiter(
+            (len(job_skills_lower & c['_skills_lower']) for c in candidates_list),
+            dtype=np.int32, count=n
+        )
+        skill_scores = skill_counts / max(len(job_skills_lower), 1)
+        matched_skills = [
+            [s for s in job_skills if s.lower() in c['_skills_lower']]
+            for c in candidates_list
+        ]
+        
+        # Experience score (20% weight)
+        experience_counts = np.fromiter(
+            (sum(1 for exp in c.get('experience', []) if exp.get('company')) for c in candidates_list),
+            dtype=np.int32, count=n
+        )
+        experience_scores = np.minimum(experience_counts / max(job_experience_req, 1), 1.0)
+        
+        # Education score (10% weight)
+        education_counts = np.fromiter(
+            (sum(1 for edu in c.get('education', []) if edu.get('degree')) for c in candidates_list),
+            dtype=np.int32, count=n
+        )
+        education_scores = np.minimum(education_counts * 0.2, 1.0)
+        
+        # Composite score
+        final_scores = (
+            similarity_scores * 0.4 +
+            skill_scores * 0.3 +
+            experience_scores * 0.2 +
+            education_scores * 0.1
+        )
+        
+        # Stable sort keeps input order among equal scores
+        return [
+            {
+                'candidate': candidates_list[i],
+                'score': float(final_scores[i]),
+                'similarity_score': float(similarity_scores[i]),
+                'skill_score': float(skill_scores[i]),
+                'experience_score': float(experience_scores[i]),
+                'education_score': float(education_scores[i]),
+                'matched_skills': matched_skills[i]
+            }
+            for i in np.argsort(-final_scores, kind='stable')
+        ]
+    
+    def rank_candidates(self, job_description, candidates_list):
+        """Rank candidates based on job requirements"""
+        return self.rank_candidates_batch(job_description, candidates_list)
 
 # Initialize matcher
 job_matcher = JobMatcher()
 
+def warm_up():
+    """Load the models and libraries used by the views ahead of the first request"""
+    nlp = _get_nlp()
+    if nlp is not None:
+        list(nlp.pipe(["warmup"]))
+    job_matcher.rank_candidates_batch("warmup", [{"about": "warmup"}])
+    _get_pdf_styles()
+
 def resume_form(request):
     """Render the resume form (HTML)"""
     return render(request, 'resume.html')
 
 @csrf_exempt
 @require_http_methods(["POST"])
-def generate_resume(request):
+async def generate_resume(request):
     """Process the resume form and generate a PDF"""
     try:
         # Extract form data
@@ -237,25 +343,65 @@ def generate_resume(request):
             ]
         }
 
-        # Generate PDF
-        pdf_buffer = generate_resume_pdf(form_data)
-
-        # Return PDF response
+        # Generate PDF straight into the response
         response = HttpResponse(content_type='application/pdf')
         filename = (form_data["name"] or "resume").replace(" ", "_")
         response['Content-Disposition'] = f'attachment; filename="{filename}.pdf"'
-        response.write(pdf_buffer.getvalue())
+        await asyncio.to_thread(generate_resume_pdf, form_data, response)
         return response
 
     except Exception as e:
         logger.exception("Error generating resume")
         return HttpResponse("Error generating resume. Please try again.", status=500)
 
-def generate_resume_pdf(data):
-    """Generate a professional PDF resume"""
-    buffer = BytesIO()
+_pdf_styles = None
+
+def _get_pdf_styles():
+    """Build the PDF styles on first use; they are never modified afterwards"""
+    global _pdf_styles
+    if _pdf_styles is None:
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.colors import HexColor
+        from reportlab.pdfbase import pdfmetrics
+        
+        styles = getSampleStyleSheet()
+        
+        # Custom styles
+        title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            spaceAfter=30,
+            alignment=1,  # Center
+            textColor=HexColor('#667eea')
+        )
+        
+        heading_style = ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=14,
+            spaceAfter=12,
+            textColor=HexColor('#764ba2'),
+            borderWidth=1,
+            borderColor=HexColor('#667eea'),
+            borderPadding=5,
+            backColor=HexColor('#f0f8ff')
+        )
+        
+        # Warm ReportLab's font cache for the fonts the styles above use
+        for font in ('Helvetica', 'Helvetica-Bold'):
+            pdfmetrics.getFont(font)
+        
+        _pdf_styles = (title_style, heading_style, styles['Normal'])
+    return _pdf_styles
+
+def generate_resume_pdf(data, output):
+    """Generate a professional PDF resume into a writable file-like object"""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+    
     doc = SimpleDocTemplate(
-        buffer,
+        output,
         pagesize=letter,
         rightMargin=72,
         leftMargin=72,
@@ -263,31 +409,7 @@ def generate_resume_pdf(data):
         bottomMargin=18
     )
 
-    styles = getSampleStyleSheet()
-
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        spaceAfter=30,
-        alignment=1,  # Center
-        textColor=HexColor('#667eea')
-    )
-
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        spaceAfter=12,
-        textColor=HexColor('#764ba2'),
-        borderWidth=1,
-        borderColor=HexColor('#667eea'),
-        borderPadding=5,
-        backColor=HexColor('#f0f8ff')
-    )
-
-    normal_style = styles['Normal']
+    title_style, heading_style, normal_style = _get_pdf_styles()
 
     story = []
 
@@ -383,8 +505,7 @@ def generate_resume_pdf(data):
         story.append(Spacer(1, 10))
 
     doc.build(story)
-    buffer.seek(0)
-    return buffer
+    return output
 
 # === Enhanced AI Endpoints ===
 
@@ -409,7 +530,7 @@ def ai_enhance_summary(request):
         return JsonResponse({'success': False, 'error': str(e)})
 
 @csrf_exempt
-def ai_analyze_job(request):
+async def ai_analyze_job(request):
     """Analyze job description and provide recommendations"""
     if request.method != 'POST':
         return JsonResponse({'success': False, 'error': 'Invalid request method'})
@@ -422,7 +543,9 @@ def ai_analyze_job(request):
             return JsonResponse({'success': False, 'error': 'Job description is required'})
         
         # Extract skills from job description
-        found_skills = job_matcher.extract_skills_from_text(job_description)
+        found_skills = await asyncio.to_thread(
+            job_matcher.extract_skills_from_text, job_description, use_spacy=True
+        )
         
         # Generate recommendations
         recommendations = generate_job_recommendations(job_description, found_skills)
@@ -470,7 +593,7 @@ def ai_suggest_skills(request):
         return JsonResponse({'success': False, 'error': str(e)})
 
 @csrf_exempt
-def rank_candidates(request):
+async def rank_candidates(request):
     """New endpoint: Rank candidates against job description"""
     if request.method != 'POST':
         return JsonResponse({'success': False, 'error': 'Invalid request method'})
@@ -483,21 +606,32 @@ def rank_candidates(request):
         if not job_description or not candidates:
             return JsonResponse({'success': False, 'error': 'Job description and candidates are required'})
         
+        # Client JSON must not be able to pose as the matcher's caches
+        candidates = [_without_cache_keys(c) for c in candidates]
+        
         # Rank candidates
-        ranked_results = job_matcher.rank_candidates(job_description, candidates)
+        ranked_results = await asyncio.to_thread(
+            job_matcher.rank_candidates_batch, job_description, candidates
+        )
+        
+        # Drop the matcher's private per-candidate caches from the response
+        top_results = [
+            {**r, 'candidate': _without_cache_keys(r['candidate'])}
+            for r in ranked_results[:10]  # Top 10
+        ]
         
         return JsonResponse({
             'success': True,
-            'ranked_candidates': ranked_results[:10],  # Top 10
+            'ranked_candidates': top_results,
             'total_candidates': len(candidates),
-            'avg_score': np.mean([r['score'] for r in ranked_results]) if ranked_results else 0
+            'avg_score': sum(r['score'] for r in ranked_results) / len(ranked_results) if ranked_results else 0
         })
     except Exception as e:
         logger.exception("Error ranking candidates")
         return JsonResponse({'success': False, 'error': str(e)})
 
 @csrf_exempt
-def match_resume_to_job(request):
+async def match_resume_to_job(request):
     """New endpoint: Match a single resume to job requirements"""
     if request.method != 'POST':
         return JsonResponse({'success': False, 'error': 'Invalid request method'})
@@ -511,26 +645,31 @@ def match_resume_to_job(request):
             return JsonResponse({'success': False, 'error': 'Job description and resume data are required'})
         
         # Calculate match score
-        similarity_score = job_matcher.compute_similarity_score(job_description, resume_data)
-        job_skills = job_matcher.extract_skills_from_text(job_description)
-        resume_skills = resume_data.get('skills', [])
+        match = await asyncio.to_thread(match_resume, job_description, resume_data)
         
-        matched_skills = [s for s in job_skills if s.lower() in [rs.lower() for rs in resume_skills]]
-        missing_skills = [s for s in job_skills if s.lower() not in [rs.lower() for rs in resume_skills]]
-        
-        return JsonResponse({
-            'success': True,
-            'match_score': round(similarity_score * 100, 2),
-            'matched_skills': matched_skills,
-            'missing_skills': missing_skills[:5],  # Top 5 missing skills
-            'improvement_suggestions': generate_improvement_suggestions(job_description, resume_data)
-        })
+        return JsonResponse({'success': True, **match})
     except Exception as e:
         logger.exception("Error matching resume to job")
         return JsonResponse({'success': False, 'error': str(e)})
 
 # Helper functions
 
+def match_resume(job_description, resume_data):
+    """Score a resume against a job description (CPU-bound; run off the event loop)"""
+    similarity_score = job_matcher.compute_similarity_score(job_description, resume_data)
+    job_skills = job_matcher.extract_skills_from_text(job_description, use_spacy=True)
+    resume_skills = {s.lower() for s in resume_data.get('skills', [])}
+    
+    matched_skills = [s for s in job_skills if s.lower() in resume_skills]
+    missing_skills = [s for s in job_skills if s.lower() not in resume_skills]
+    
+    return {
+        'match_score': round(similarity_score * 100, 2),
+        'matched_skills': matched_skills,
+        'missing_skills': missing_skills[:5],  # Top 5 missing skills
+        'improvement_suggestions': generate_improvement_suggestions(job_skills, resume_data)
+    }
+
 def generate_enhanced_summary(original, skills, experience):
     """Generate an enhanced professional summary"""
     if not original.strip():
@@ -563,20 +702,21 @@ def generate_job_recommendations(job_description, found_skills):
     if found_skills:
         recommendations.append(f"Emphasize your experience with: {', '.join(found_skills[:3])}")
     
-    if 'agile' in job_description.lower() or 'scrum' in job_description.lower():
+    job_description_lower = job_description.lower()
+    
+    if 'agile' in job_description_lower or 'scrum' in job_description_lower:
         recommendations.append("Highlight your experience with Agile methodologies")
     
-    if 'lead' in job_description.lower() or 'senior' in job_description.lower():
+    if 'lead' in job_description_lower or 'senior' in job_description_lower:
         recommendations.append("Emphasize leadership experience and mentoring capabilities")
     
     return recommendations
 
-def generate_improvement_suggestions(job_description, resume_data):
+def generate_improvement_suggestions(job_skills, resume_data):
     """Generate suggestions to improve resume match"""
     suggestions = []
     
-    job_skills = job_matcher.extract_skills_from_text(job_description)
-    resume_skills = [s.lower() for s in resume_data.get('skills', [])]
+    resume_skills = {s.lower() for s in resume_data.get('skills', [])}
     
     missing_skills = [s for s in job_skills if s.lower() not in resume_skills]
     if missing_skills: